@@ -5,6 +5,12 @@ from io import BytesIO
 import re
 import traceback
 import os
+import hashlib
+import itertools
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
@@ -34,6 +40,90 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# ✅ One shared client (and its HTTP connection pool) instead of a new one per request
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    global _openai_client
+    with _openai_client_lock:
+        if _openai_client is None:
+            _openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        return _openai_client
+
+
+# ---- Opt-in memory profiling (MEMORY_PROFILING=1) ----
+MEMORY_PROFILING = os.getenv("MEMORY_PROFILING", "").lower() in ("1", "true", "yes")
+MEMORY_PROFILE_TOP = int(os.getenv("MEMORY_PROFILE_TOP", "10"))
+# Profile one request in N (1 = every request that finds the profiler free)
+MEMORY_PROFILE_SAMPLE = max(int(os.getenv("MEMORY_PROFILE_SAMPLE", "1")), 1)
+_memory_records = deque(maxlen=int(os.getenv("MEMORY_PROFILE_HISTORY", "100")))
+# tracemalloc is process-wide, so at most one request is profiled at a time.
+# Requests that find the profiler busy run unprofiled and never wait on it;
+# their allocations can still show up in the profiled request's diff.
+_memory_profile_lock = threading.Lock()
+_memory_profile_counter = itertools.count()
+
+
+@app.before_request
+def start_memory_profile():
+    if not MEMORY_PROFILING or request.endpoint == "memory_debug":
+        return
+    if next(_memory_profile_counter) % MEMORY_PROFILE_SAMPLE:
+        return
+    if not _memory_profile_lock.acquire(blocking=False):
+        return
+    try:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+        tracemalloc.reset_peak()
+        start_current = tracemalloc.get_traced_memory()[0]
+        request.environ["memory_profile.start"] = (time.perf_counter(), start_current, tracemalloc.take_snapshot())
+    except Exception:
+        _memory_profile_lock.release()
+        raise
+
+
+@app.teardown_request
+def finish_memory_profile(exc):
+    started = request.environ.pop("memory_profile.start", None)
+    if started is None:
+        return
+    try:
+        start_time, start_current, start_snapshot = started
+        current, peak = tracemalloc.get_traced_memory()
+        end_snapshot = tracemalloc.take_snapshot()
+        stats = end_snapshot.compare_to(start_snapshot, "lineno")
+        _memory_records.append({
+            "path": request.path,
+            "method": request.method,
+            "at": datetime.utcnow().isoformat() + "Z",
+            "duration_ms": round((time.perf_counter() - start_time) * 1000, 1),
+            "current_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            # Peak above what was already traced when the request started
+            "request_peak_kb": round((peak - start_current) / 1024, 1),
+            "top_allocations": [
+                {
+                    "site": str(stat.traceback[0]),
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats[:MEMORY_PROFILE_TOP]
+            ],
+        })
+    finally:
+        _memory_profile_lock.release()
+
+
+@app.route("/debug/memory", methods=["GET"])
+def memory_debug():
+    if not MEMORY_PROFILING:
+        return jsonify({"message": "Memory profiling is disabled. Set MEMORY_PROFILING=1."}), 404
+    return jsonify({"records": list(_memory_records)})
+
+
 @app.route("/", methods=["GET"])
 def home():
     return "Resume Automation API is live 🚀. Use /submit with POST."
@@ -300,53 +390,142 @@ def add_summary_section(doc, lines, idx):
 
 
 
-def extract_total_experience(candidate_info: str) -> str:
-    # Normalize dashes
-    candidate_info = candidate_info.replace("–", "-").replace("—", "-")
+def parse_month_year(value: str):
+    # "Sept 2021" is common in resumes but not a valid %b abbreviation
+    value = re.sub(r"^sept\b", "Sep", value.strip(), flags=re.IGNORECASE)
+    for fmt in ("%b %Y", "%B %Y", "%m/%Y"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
 
-    # Extract all duration lines
-    duration_lines = re.findall(r"Duration:\s*(.+)", candidate_info, re.IGNORECASE)
 
-    total_months = 0
-    today = datetime.today()
+def parse_roles(candidate_info: str):
+    # Normalize dashes
+    candidate_info = candidate_info.replace("–", "-").replace("—", "-")
+    lines = [ln.strip() for ln in candidate_info.splitlines()]
+
+    roles = []
+    unparsed = []
+    heading = ""
+
+    for line in lines:
+        match = re.match(r"Duration:\s*(.+)", line, re.IGNORECASE)
+        if not match:
+            # Last non-empty line before a Duration line; may be a title or a company
+            if line:
+                heading = line
+            continue
 
-    for line in duration_lines:
         # Split into start and end
-        parts = [p.strip() for p in line.split("-")]
+        parts = [p.strip() for p in match.group(1).split("-")]
         if len(parts) != 2:
+            unparsed.append(match.group(1).strip())
             continue
-        
+
         start_str, end_str = parts
+        start_date = parse_month_year(start_str)
 
-        # Parse start date
-        try:
-            start_date = datetime.strptime(start_str, "%b %Y")
-        except ValueError:
-            start_date = datetime.strptime(start_str, "%B %Y")
+        # Handle "Present" (its months are computed per request, see role_months)
+        is_current = "present" in end_str.lower()
+        end_date = None if is_current else parse_month_year(end_str)
 
-        # Handle "Present"
-        if "present" in end_str.lower():
-            end_date = today
-        else:
-            try:
-                end_date = datetime.strptime(end_str, "%b %Y")
-            except ValueError:
-                end_date = datetime.strptime(end_str, "%B %Y")
+        if start_date is None or (not is_current and (end_date is None or end_date < start_date)):
+            unparsed.append(match.group(1).strip())
+            continue
+
+        roles.append({
+            "heading": heading,
+            "start": start_str,
+            "end": end_str,
+            "start_month": start_date.strftime("%Y-%m"),
+            "end_month": None if is_current else end_date.strftime("%Y-%m"),
+            "current": is_current,
+        })
 
-        # Calculate duration in months
-        months = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month)
-        total_months += months
+    return roles, unparsed
 
-        # Print each duration separately
-        years, m = divmod(months, 12)
-        # print(f"{start_str} – {end_str}: {years} years {m} months")
+
+def role_months(role: dict, today=None) -> int:
+    start_date = datetime.strptime(role["start_month"], "%Y-%m")
+    if role["current"]:
+        end_date = today or datetime.today()
+    else:
+        end_date = datetime.strptime(role["end_month"], "%Y-%m")
+    months = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month)
+    return max(months, 0)
+
+
+def format_total_experience(roles: list, today=None) -> str:
+    total_months = sum(role_months(role, today) for role in roles)
 
     # Convert total months into years+months
     total_years, total_m = divmod(total_months, 12)
-    print(f"Total Experience: {total_years} years {total_m} months")
     return f"Total Experience: {total_years} years {total_m} months"
 
 
+def build_candidate_digest(candidate_info: str) -> str:
+    # Whitespace-normalized candidate text: the prompts need the full work history,
+    # so this only collapses spacing and blank lines and keeps the profile id stable
+    lines = [re.sub(r"[ \t]+", " ", ln).strip() for ln in candidate_info.splitlines()]
+    digest = "\n".join(lines)
+    digest = re.sub(r"\n{3,}", "\n\n", digest)
+    return digest.strip()
+
+
+# ---- Candidate profile registry ----
+PROFILE_STORE_MAX = int(os.getenv("PROFILE_STORE_MAX", "500"))
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def register_profile(candidate_info: str) -> dict:
+    digest = build_candidate_digest(candidate_info)
+    # Same candidate text always maps to the same id, so re-registering is free
+    profile_id = hashlib.sha256(digest.encode("utf-8")).hexdigest()[:32]
+
+    with _profiles_lock:
+        profile = _profiles.get(profile_id)
+        if profile is not None:
+            _profiles.move_to_end(profile_id)
+            return profile
+
+    roles, unparsed = parse_roles(digest)
+    profile = {
+        "profile_id": profile_id,
+        "roles": roles,
+        # Non-empty means total_experience undercounts
+        "unparsed_durations": unparsed,
+        "digest": digest,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+    }
+
+    with _profiles_lock:
+        _profiles[profile_id] = profile
+        _profiles.move_to_end(profile_id)
+        # Evict least recently used profiles once the store is full
+        while len(_profiles) > PROFILE_STORE_MAX:
+            _profiles.popitem(last=False)
+
+    return profile
+
+
+def profile_response(profile: dict) -> dict:
+    # Months for "Present" roles depend on today's date, so compute them per call
+    today = datetime.today()
+    roles = [dict(role, months=role_months(role, today)) for role in profile["roles"]]
+    return dict(profile, roles=roles, total_experience=format_total_experience(profile["roles"], today))
+
+
+def get_profile(profile_id: str):
+    with _profiles_lock:
+        profile = _profiles.get(profile_id)
+        if profile is not None:
+            _profiles.move_to_end(profile_id)
+        return profile
+
+
 # ---- Main Word generator ----
 def create_resume_word(content: str) -> Document:
     doc = Document()
@@ -402,50 +581,77 @@ def create_resume_word(content: str) -> Document:
 def create_resume_pdf(resume_text: str) -> BytesIO:
     # Step 1: Create Word doc
     tmp_docx = tempfile.NamedTemporaryFile(delete=False, suffix=".docx")
-    doc = create_resume_word(resume_text)
-    doc.save(tmp_docx.name)
-
-    # Step 2: Prepare PDF path
+    tmp_docx.close()  # ✅ only the path is needed; don't keep the handle open
     tmp_pdf_path = os.path.splitext(tmp_docx.name)[0] + ".pdf"
 
-    # Step 3: Determine LibreOffice executable path
-    system = platform.system()
-    if system == "Windows":
-        # Change this path if LibreOffice installed elsewhere
-        soffice_path = r"C:\Program Files\LibreOffice\program\soffice.exe"
-    else:
-        soffice_path = "libreoffice"  # Linux / Mac assumes in PATH
-
-    # Step 4: Convert DOCX -> PDF
     try:
-        subprocess.run([
-            soffice_path,
-            "--headless",
-            "--convert-to", "pdf",
-            tmp_docx.name,
-            "--outdir", os.path.dirname(tmp_pdf_path)
-        ], check=True)
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"LibreOffice PDF conversion failed: {e}")
-    except FileNotFoundError:
-        raise RuntimeError(f"LibreOffice not found at {soffice_path}. Install it or update the path.")
-
-    # Step 5: Read PDF
-    with open(tmp_pdf_path, "rb") as f:
-        pdf_bytes = BytesIO(f.read())
-
-    # Step 6: Cleanup
-    try:
-        os.remove(tmp_docx.name)
-        os.remove(tmp_pdf_path)
-    except OSError:
-        pass
+        doc = create_resume_word(resume_text)
+        doc.save(tmp_docx.name)
+
+        # Step 2: Determine LibreOffice executable path
+        system = platform.system()
+        if system == "Windows":
+            # Change this path if LibreOffice installed elsewhere
+            soffice_path = r"C:\Program Files\LibreOffice\program\soffice.exe"
+        else:
+            soffice_path = "libreoffice"  # Linux / Mac assumes in PATH
+
+        # Step 3: Convert DOCX -> PDF
+        try:
+            subprocess.run([
+                soffice_path,
+                "--headless",
+                "--convert-to", "pdf",
+                tmp_docx.name,
+                "--outdir", os.path.dirname(tmp_pdf_path)
+            ], check=True)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"LibreOffice PDF conversion failed: {e}")
+        except FileNotFoundError:
+            raise RuntimeError(f"LibreOffice not found at {soffice_path}. Install it or update the path.")
+
+        # Step 4: Read PDF
+        with open(tmp_pdf_path, "rb") as f:
+            pdf_bytes = BytesIO(f.read())
+    finally:
+        # Step 5: Cleanup (also on failure, so temp files never pile up)
+        for path in (tmp_docx.name, tmp_pdf_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
     pdf_bytes.seek(0)
     return pdf_bytes
 
 
-# ---- API endpoint ----
+# ---- API endpoints ----
+@app.route("/profiles", methods=["POST"])
+def create_profile():
+    try:
+        data = request.get_json(force=True, silent=False)
+    except Exception:
+        return jsonify({"message": "Invalid JSON"}), 400
+
+    candidate_info = (data or {}).get("candidate_info") or ""
+    if not isinstance(candidate_info, str):
+        return jsonify({"message": "candidate_info must be a string"}), 400
+    candidate_info = candidate_info.strip()
+    if not candidate_info:
+        return jsonify({"message": "Missing required fields"}), 400
+
+    profile = register_profile(candidate_info)
+    return jsonify(profile_response(profile)), 201
+
+
+@app.route("/profiles/<profile_id>", methods=["GET"])
+def read_profile(profile_id):
+    profile = get_profile(profile_id)
+    if profile is None:
+        return jsonify({"message": "Unknown profile_id"}), 404
+    return jsonify(profile_response(profile))
+
+
 @app.route("/submit", methods=["POST"])
 def submit():
     try:
@@ -454,16 +660,32 @@ def submit():
         return jsonify({"message": "Invalid JSON"}), 400
 
     job_desc = (data or {}).get("job_desc", "").strip()
-    candidate_info = (data or {}).get("candidate_info", "").strip()
+    profile_id = (data or {}).get("profile_id") or ""
+    if not isinstance(profile_id, str):
+        return jsonify({"message": "profile_id must be a string"}), 400
+    profile_id = profile_id.strip()
     file_type = (data or {}).get("file_type", "word").strip().lower()
 
-    work_exp_str = extract_total_experience(candidate_info)
+    # ✅ Prefer a registered profile; fall back to raw candidate_info for older clients
+    if profile_id:
+        profile = get_profile(profile_id)
+        if profile is None:
+            return jsonify({"message": "Unknown profile_id"}), 404
+    else:
+        candidate_info = (data or {}).get("candidate_info") or ""
+        if not isinstance(candidate_info, str):
+            return jsonify({"message": "candidate_info must be a string"}), 400
+        candidate_info = candidate_info.strip()
+        profile = register_profile(candidate_info) if candidate_info else None
 
-    if not job_desc or not candidate_info:
+    if not job_desc or profile is None:
         return jsonify({"message": "Missing required fields"}), 400
 
+    candidate_info = profile["digest"]
+    work_exp_str = format_total_experience(profile["roles"])
+
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client()
         
         # Define function for main resume sections
         def generate_main_sections():
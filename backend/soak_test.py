@@ -0,0 +1,198 @@
+"""
+Soak test: run thousands of mixed Word/PDF generations through /submit
+against a stubbed LLM and check RSS, open file descriptors and temp-dir
+contents for unbounded growth.
+
+Usage:
+    python soak_test.py --iterations 2000 --pdf-ratio 0.2
+    MEMORY_PROFILING=1 python soak_test.py --iterations 200   # also dumps /debug/memory
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "soak-test")
+
+import app as resume_app
+
+
+CANDIDATE_INFO = """Jane Doe
+Email: jane.doe@example.com | Phone: +1 5551234567 | Location: Austin, TX
+
+Work Experience
+Acme Corp – Austin, TX
+Senior Software Engineer
+Duration: Jan 2021 – Present
+
+Globex – Dallas, TX
+Software Engineer
+Duration: June 2017 – Dec 2020
+
+Education
+MS in Computer Science, University of Texas
+"""
+
+JOB_DESC = "Backend engineer with Python, Flask, AWS, Docker, Kubernetes and PostgreSQL experience."
+
+MAIN_SECTIONS = """Jane Doe
+Email: jane.doe@example.com | Phone: +1 5551234567 | Location: Austin, TX
+PROFESSIONAL SUMMARY
+- 7+ years of experience building backend services in Python and Flask across cloud platforms.
+- Designed and operated containerized microservices on AWS with Docker and Kubernetes.
+SKILLS
+Programming Languages
+- Python
+- Java
+- SQL
+Cloud Platforms: AWS EC2, S3, Lambda, CloudWatch
+CERTIFICATIONS
+- AWS Certified Developer
+EDUCATION
+MS in Computer Science
+University of Texas | GPA: 3.8/4.0
+"""
+
+WORK_EXPERIENCE = """WORK EXPERIENCE
+Acme Corp – Austin, TX
+Senior Software Engineer – Jan 2021 to Present
+""" + "\n".join(
+    f"- Engineered service {i} in Python and Flask, cutting p95 latency by {10 + i}% across AWS workloads."
+    for i in range(15)
+) + """
+Technologies Used: Python, Flask, AWS, Docker, Kubernetes, PostgreSQL
+Globex – Dallas, TX
+Software Engineer – June 2017 to Dec 2020
+""" + "\n".join(
+    f"- Automated pipeline {i} with Jenkins and Docker, reducing deployment time by {5 + i}%."
+    for i in range(12)
+) + """
+Technologies Used: Java, Jenkins, Docker, MySQL
+"""
+
+
+class StubCompletions:
+    def create(self, model, messages, temperature):
+        system = messages[0]["content"]
+        content = WORK_EXPERIENCE if "Work Experience" in system else MAIN_SECTIONS
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class StubClient:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=StubCompletions())
+
+
+def rss_kb():
+    # Current (not peak) RSS; Linux only
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def open_fds():
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+
+def temp_files():
+    tmp = tempfile.gettempdir()
+    return {name for name in os.listdir(tmp) if name.endswith((".docx", ".pdf"))}
+
+
+def sample():
+    gc.collect()
+    return {"rss_kb": rss_kb(), "fds": open_fds(), "temp_files": temp_files()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--pdf-ratio", type=float, default=0.2, help="Share of requests asking for PDF (needs LibreOffice)")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50.0)
+    parser.add_argument("--max-fd-growth", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    resume_app._openai_client = StubClient()
+    client = resume_app.app.test_client()
+
+    res = client.post("/profiles", json={"candidate_info": CANDIDATE_INFO})
+    profile_id = res.get_json()["profile_id"]
+
+    def run_one():
+        file_type = "pdf" if random.random() < args.pdf_ratio else "word"
+        # Mix both request styles: registered profile and raw candidate_info
+        payload = {"job_desc": JOB_DESC, "file_type": file_type}
+        if random.random() < 0.5:
+            payload["profile_id"] = profile_id
+        else:
+            payload["candidate_info"] = CANDIDATE_INFO
+        res = client.post("/submit", json=payload)
+        body = res.get_data()
+        res.close()
+        if res.status_code != 200:
+            raise SystemExit(f"/submit ({file_type}) failed with {res.status_code}: {body[:300]!r}")
+
+    for _ in range(args.warmup):
+        run_one()
+    baseline = sample()
+    print(f"baseline: rss={baseline['rss_kb']} kB fds={baseline['fds']} temp_files={len(baseline['temp_files'])}")
+
+    started = time.perf_counter()
+    checkpoint = max(args.iterations // 10, 1)
+    for i in range(1, args.iterations + 1):
+        run_one()
+        if i % checkpoint == 0:
+            s = sample()
+            print(f"[{i}/{args.iterations}] rss={s['rss_kb']} kB fds={s['fds']} temp_files={len(s['temp_files'])}")
+    elapsed = time.perf_counter() - started
+    final = sample()
+
+    failures = []
+    if baseline["rss_kb"] is not None and final["rss_kb"] is not None:
+        growth_mb = (final["rss_kb"] - baseline["rss_kb"]) / 1024
+        print(f"RSS growth: {growth_mb:.1f} MB")
+        if growth_mb > args.max_rss_growth_mb:
+            failures.append(f"RSS grew by {growth_mb:.1f} MB (limit {args.max_rss_growth_mb} MB)")
+    if baseline["fds"] is not None and final["fds"] is not None:
+        fd_growth = final["fds"] - baseline["fds"]
+        print(f"FD growth: {fd_growth}")
+        if fd_growth > args.max_fd_growth:
+            failures.append(f"Open file descriptors grew by {fd_growth} (limit {args.max_fd_growth})")
+    leaked = final["temp_files"] - baseline["temp_files"]
+    if leaked:
+        failures.append(f"{len(leaked)} temp files left behind, e.g. {sorted(leaked)[:5]}")
+
+    print(f"{args.iterations} generations in {elapsed:.1f}s ({args.iterations / elapsed:.1f}/s)")
+
+    if resume_app.MEMORY_PROFILING:
+        records = client.get("/debug/memory").get_json()["records"]
+        print(json.dumps(records[-1:], indent=2))
+
+    if failures:
+        for failure in failures:
+            print("FAIL:", failure)
+        return 1
+    print("OK: no unbounded growth detected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,41 @@
+const API_BASE = "https://resume-automation-ylxh.onrender.com";
+
+// Only a hash of the candidate text is cached, never the text itself
+async function hashText(text) {
+    const digest = await crypto.subtle.digest("SHA-256", new TextEncoder().encode(text));
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, "0")).join("");
+}
+
+// Register candidate info once and reuse the profile id while the text is unchanged
+async function getProfileId(candidate_info) {
+    const candidate_hash = await hashText(candidate_info);
+    const cached = JSON.parse(localStorage.getItem("candidate_profile") || "null");
+    if (cached && cached.candidate_hash === candidate_hash) {
+        return cached.profile_id;
+    }
+
+    let res = await fetch(`${API_BASE}/profiles`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ candidate_info })
+    });
+    if (!res.ok) {
+        throw new Error("Profile registration failed");
+    }
+
+    let profile = await res.json();
+    localStorage.setItem("candidate_profile", JSON.stringify({ candidate_hash, profile_id: profile.profile_id }));
+    return profile.profile_id;
+}
+
+async function submitResume(payload) {
+    return fetch(`${API_BASE}/submit`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(payload)
+    });
+}
+
 document.getElementById("dataForm").addEventListener("submit", async function(e) {
     e.preventDefault();
 
@@ -9,12 +47,15 @@ document.getElementById("dataForm").addEventListener("submit", async function(e)
     document.getElementById("response").innerText = "Generating resume...";
 
     try {
-        let res = await fetch("https://resume-automation-ylxh.onrender.com/submit", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            // body: JSON.stringify({ job_desc, candidate_info, gpt_token, file_type })
-            body: JSON.stringify({ job_desc, candidate_info, file_type })
-        });
+        let profile_id = await getProfileId(candidate_info);
+        let res = await submitResume({ job_desc, profile_id, file_type });
+
+        // Profile unknown to this server worker (restart or another worker): send the raw
+        // candidate info, which works anywhere, and register again on the next click
+        if (res.status === 404) {
+            localStorage.removeItem("candidate_profile");
+            res = await submitResume({ job_desc, candidate_info, file_type });
+        }
 
         if (!res.ok) {
             document.getElementById("response").innerText = "Error generating file";